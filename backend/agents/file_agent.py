@@ -3,11 +3,41 @@
 import os
 import json
 import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
 from flask import Blueprint, request, jsonify, current_app
 
+from backend.utils.vector_store import remove_index
+
+try:
+    import fcntl
+except ImportError:  # Windows: dev server only, no multi-process serving
+    fcntl = None
+
 file_bp = Blueprint("file_bp", __name__)
 
 REGISTRY = os.path.join("data", "uploads", "files.json")
+REGISTRY_LOCK = REGISTRY + ".lock"
+
+# flock() is per open file, so threads of one worker need their own lock too
+_THREAD_LOCK = threading.Lock()
+
+@contextmanager
+def _registry_lock():
+    """
+    Serialize registry read-modify-write cycles across threads and worker
+    processes. Hold it around `_load_registry()` ... `_save_registry()`.
+    """
+    os.makedirs(os.path.dirname(REGISTRY_LOCK), exist_ok=True)
+    with _THREAD_LOCK, open(REGISTRY_LOCK, "a") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
 
 def _load_registry():
     if os.path.exists(REGISTRY):
@@ -16,9 +46,16 @@ def _load_registry():
     return []
 
 def _save_registry(files):
+    # Write to a temp file and swap it in, so readers never see a partial file
     os.makedirs(os.path.dirname(REGISTRY), exist_ok=True)
-    with open(REGISTRY, "w", encoding="utf-8") as f:
-        json.dump(files, f, indent=2)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(REGISTRY), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(files, f, indent=2)
+        os.replace(tmp_path, REGISTRY)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
 
 @file_bp.route("/", methods=["GET"])
 def list_files():
@@ -37,20 +74,25 @@ def delete_files():
     """
     data = request.get_json() or {}
     to_del = data.get("files", "all")
-    registry = _load_registry()
-    kept = []
-
-    # delete matching entries
-    for entry in registry:
-        name = entry["name"]
-        if to_del == "all" or name in to_del:
-            # remove upload dir
-            if os.path.exists(entry["dir"]):
-                shutil.rmtree(entry["dir"])
-            # TODO: also remove vectors for that file from FAISS
-        else:
-            kept.append(entry)
-
-    _save_registry(kept)
+
+    with _registry_lock():
+        registry = _load_registry()
+        kept = []
+
+        # delete matching entries
+        for entry in registry:
+            name = entry["name"]
+            if to_del == "all" or name in to_del:
+                # remove upload dir
+                upload_dir = entry.get("upload_dir") or entry.get("dir")
+                if upload_dir and os.path.exists(upload_dir):
+                    shutil.rmtree(upload_dir)
+                # remove its per-file index and sidecars
+                if entry.get("index_path"):
+                    remove_index(entry["index_path"])
+            else:
+                kept.append(entry)
+
+        _save_registry(kept)
     # Optionally: completely rebuild the vector index from remaining files
     return jsonify({"deleted": to_del}), 200
@@ -8,10 +8,10 @@ from werkzeug.utils import secure_filename
 from backend.utils.parsers import parse_file
 from backend.utils.chunker import chunk_text
 from backend.utils.embeddings import embed_texts
-from backend.utils.vector_store import load_index, save_index, add_to_index
+from backend.utils.vector_store import init_index, save_index, add_to_index
 from backend.utils.mcp import make_message, log_message
 
-from backend.agents.file_agent import _load_registry, _save_registry
+from backend.agents.file_agent import _load_registry, _save_registry, _registry_lock
 
 ingest_bp = Blueprint('ingest_bp', __name__)
 
@@ -55,9 +55,11 @@ def ingest():
     os.makedirs(idx_dir, exist_ok=True)
     index_path = os.path.join(idx_dir, f"{upload_id}.faiss")
 
-    # 6. Load or init FAISS index
+    # 6. Init a fresh FAISS index (upload_id is new, so nothing to load).
+    #    Metadata is kept local so concurrent ingests cannot interleave.
     emb_dim = embeddings.shape[1]
-    index = load_index(index_path, dim=emb_dim)
+    index = init_index(emb_dim)
+    contents = []
 
     # 7. Add embeddings + metadata
     for emb, chunk in zip(embeddings, chunks):
@@ -67,20 +69,21 @@ def ingest():
             "filename": filename,
             "file_id":  upload_id
         }
-        add_to_index(index, emb, metadata)
+        add_to_index(index, emb, metadata, contents)
 
     # 8. Save index and metadata
-    save_index(index, index_path)
+    save_index(index, index_path, contents)
 
     # 9. Update global registry
-    registry = _load_registry()
-    registry.append({
-        "id":         upload_id,
-        "name":       filename,
-        "index_path": index_path,
-        "upload_dir": upload_dir
-    })
-    _save_registry(registry)
+    with _registry_lock():
+        registry = _load_registry()
+        registry.append({
+            "id":         upload_id,
+            "name":       filename,
+            "index_path": index_path,
+            "upload_dir": upload_dir
+        })
+        _save_registry(registry)
 
     # MCP: log completion
     msg = make_message(
@@ -2,8 +2,7 @@
 
 import uuid
 from flask import Blueprint, request, jsonify, current_app
-from llama_cpp import Llama
-
+from backend.utils.llm import get_llm, generate
 from backend.utils.mcp import make_message, log_message
 
 respond_bp = Blueprint('respond_bp', __name__)
@@ -17,7 +16,7 @@ def respond():
          - results (List[{"score": float, "source": {...}, "text": str}])
     2. Log receipt via MCP.
     3. Assemble prompt from contexts + question.
-    4. Load & call the local Llama 2 model.
+    4. Call the local Llama 2 model (loaded once per process).
     5. Log completion via MCP.
     6. Return { trace_id, answer, sources }.
     """
@@ -44,18 +43,19 @@ def respond():
     prompt = "\n\n".join(prompt_parts)
     prompt += f"\n\nQuestion: {query}\nAnswer:"
 
-    # Load the model (will use the .gguf file in /models)
-    llm = Llama(
-        model_path=current_app.config["MODEL_PATH"],
+    # Reuse the process-wide model (will use the .gguf file in /models)
+    llm = get_llm(
+        current_app.config["MODEL_PATH"],
         n_ctx=current_app.config.get("N_CTX", 2048),
-        n_gpu_layers=current_app.config.get("N_GPU_LAYERS", 32)
+        n_gpu_layers=current_app.config.get("N_GPU_LAYERS", 32),
+        n_threads=current_app.config.get("N_THREADS")
     )
 
     # Perform generation
-    resp = llm(
+    resp = generate(
+        llm,
         prompt,
-        max_tokens=current_app.config.get("MAX_TOKENS", 256),
-        stop=None
+        max_tokens=current_app.config.get("MAX_TOKENS", 256)
     )
     answer = resp["choices"][0]["text"].strip()
 
@@ -4,7 +4,7 @@ import uuid
 from flask import Blueprint, request, jsonify
 
 from backend.utils.embeddings import embed_texts
-from backend.utils.vector_store import load_index, search_index
+from backend.utils.vector_store import open_vectors_readonly, search_vectors
 from backend.utils.mcp import make_message, log_message
 from backend.agents.file_agent import _load_registry
 
@@ -55,10 +55,10 @@ def retrieve():
             continue
 
         statuses.append(f"Loading index for {entry['name']}")
-        idx = load_index(entry["index_path"])
+        vectors, contents = open_vectors_readonly(entry["index_path"])
         statuses.append(f"Searching index for {entry['name']}")
 
-        hits = search_index(idx, q_emb, top_k)
+        hits = search_vectors(vectors, q_emb, top_k, contents)
         statuses.append(f"Found {len(hits)} hits in {entry['name']}")
 
         for h in hits:
@@ -5,14 +5,21 @@ from backend.agents.ingestion_agent import ingest_bp
 from backend.agents.retrieval_agent  import retrieve_bp
 from backend.agents.response_agent   import respond_bp
 from backend.agents.file_agent     import file_bp
+from backend import config
 import os
 
 def create_app():
     app = Flask(__name__)
 
-    # Config: you can later load from env or a config file
-    app.config["MODEL_PATH"] = "models/llama-2-7b.Q4_K_M.gguf"
-    app.config["VECTOR_STORE_PATH"] = "data/vector_index.faiss"
+    # Config: every setting can be overridden from the environment (backend/config.py)
+    app.config["MODEL_PATH"] = config.MODEL_PATH
+    app.config["N_CTX"] = config.N_CTX
+    app.config["N_GPU_LAYERS"] = config.N_GPU_LAYERS
+    app.config["GPU_OFFLOAD"] = config.GPU_OFFLOAD
+    app.config["MAX_TOKENS"] = config.MAX_TOKENS
+    app.config["N_THREADS"] = config.N_THREADS
+    app.config["PRELOAD_LLM"] = config.PRELOAD_LLM
+    app.config["VECTOR_STORE_PATH"] = config.VECTOR_STORE_PATH
     os.makedirs(os.path.dirname(app.config["VECTOR_STORE_PATH"]), exist_ok=True)
 
 
@@ -25,6 +32,6 @@ def create_app():
     return app
 
 if __name__ == "__main__":
-    # For quick local runs
+    # For quick local runs; use `gunicorn backend.wsgi:app` in production
     app = create_app()
     app.run(host="0.0.0.0", port=5000, debug=True)
@@ -0,0 +1,38 @@
+# backend/config.py
+#
+# Settings read from the environment. Kept free of heavy imports so that
+# gunicorn.conf.py can use it without loading any models.
+
+import multiprocessing
+import os
+
+def env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+def env_bool(name, default=False):
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+MODEL_PATH   = os.getenv("MODEL_PATH", "models/llama-2-7b.Q4_K_M.gguf")
+N_CTX        = env_int("N_CTX", 2048)
+N_GPU_LAYERS = env_int("N_GPU_LAYERS", 32)
+MAX_TOKENS   = env_int("MAX_TOKENS", 256)
+# Load the LLM in the master process before workers fork (CPU-only setups)
+PRELOAD_LLM  = env_bool("PRELOAD_LLM")
+VECTOR_STORE_PATH = os.getenv("VECTOR_STORE_PATH", "data/vector_index.faiss")
+
+# Any non-zero N_GPU_LAYERS offloads to the GPU (-1 means every layer)
+GPU_OFFLOAD = N_GPU_LAYERS != 0
+
+# Every worker holds its own LLM; with GPU offload that means its own copy of
+# the offloaded layers in VRAM, so default to a single worker in that case.
+WEB_WORKERS = env_int("WEB_WORKERS", 1 if GPU_OFFLOAD else multiprocessing.cpu_count())
+WEB_THREADS = env_int("WEB_THREADS", 2)
+# CPU threads for llama.cpp and torch in each worker, so that all workers
+# together use about one thread per core instead of oversubscribing them
+N_THREADS   = env_int("N_THREADS", max(1, multiprocessing.cpu_count() // WEB_WORKERS))
+WEB_TIMEOUT = env_int("WEB_TIMEOUT", 300)
+BIND        = os.getenv("BIND", "0.0.0.0:5000")
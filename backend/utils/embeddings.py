@@ -1,14 +1,35 @@
 # backend/utils/embeddings.py
 
+import os
+import threading
+import torch
 from sentence_transformers import SentenceTransformer
 
-# load once at import
-_EMBED_MODEL = SentenceTransformer("all-MiniLM-L6-v2")
+from backend import config
+
+# Loaded on first use, not at import: backend/wsgi.py is imported in the
+# Gunicorn master, and a CUDA context created there does not survive fork().
+_EMBED_MODEL = None
+_LOAD_LOCK = threading.Lock()
+
+def _get_model():
+    global _EMBED_MODEL
+    if _EMBED_MODEL is None:
+        with _LOAD_LOCK:
+            if _EMBED_MODEL is None:
+                # Runs in the worker after fork, so this sizes its own intra-op pool
+                torch.set_num_threads(config.N_THREADS)
+                # EMBED_DEVICE: "cpu", "cuda", ...; unset lets the library choose
+                _EMBED_MODEL = SentenceTransformer(
+                    "all-MiniLM-L6-v2",
+                    device=os.getenv("EMBED_DEVICE") or None
+                )
+    return _EMBED_MODEL
 
 def embed_texts(texts):
     """
     texts: List[str]
     returns: List[np.ndarray] (one per text)
     """
-    embeddings = _EMBED_MODEL.encode(texts, convert_to_numpy=True, show_progress_bar=False)
+    embeddings = _get_model().encode(texts, convert_to_numpy=True, show_progress_bar=False)
     return embeddings
@@ -0,0 +1,34 @@
+# backend/utils/llm.py
+
+import threading
+from llama_cpp import Llama
+
+# One model per process: loaded on first use, or before fork via backend/wsgi.py
+_LLM = None
+_LOAD_LOCK = threading.Lock()
+# llama.cpp contexts are not thread-safe, so generation is serialized per process
+_GEN_LOCK = threading.Lock()
+
+def get_llm(model_path, n_ctx=2048, n_gpu_layers=32, n_threads=None):
+    """
+    Return the process-wide Llama instance, loading it on the first call.
+    The GGUF weights are mmap'd by llama.cpp, so workers share their pages.
+    """
+    global _LLM
+    if _LLM is None:
+        with _LOAD_LOCK:
+            if _LLM is None:
+                _LLM = Llama(
+                    model_path=model_path,
+                    n_ctx=n_ctx,
+                    n_gpu_layers=n_gpu_layers,
+                    n_threads=n_threads
+                )
+    return _LLM
+
+def generate(llm, prompt, max_tokens=256):
+    """
+    Run a single completion and return the raw llama.cpp response.
+    """
+    with _GEN_LOCK:
+        return llm(prompt, max_tokens=max_tokens, stop=None)
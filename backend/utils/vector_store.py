@@ -1,11 +1,18 @@
 import os
 import json
+import threading
+from collections import OrderedDict
 import faiss
 import numpy as np
 
 # In-memory store of each chunk’s text and its source metadata
 _CONTENTS = []
 
+# Read-only indexes opened for search, keyed by path -> (mtime, vectors, contents)
+_READONLY_CACHE = OrderedDict()
+_READONLY_CACHE_MAX = 32
+_READONLY_LOCK = threading.Lock()
+
 def init_index(dim: int) -> faiss.IndexFlatIP:
     """Create a new FAISS IndexFlatIP of the given dimension."""
     return faiss.IndexFlatIP(dim)
@@ -35,27 +42,97 @@ def load_index(path: str, dim: int = None) -> faiss.IndexFlatIP:
     _CONTENTS.clear()
     return init_index(dim)
 
-def save_index(index: faiss.IndexFlatIP, path: str):
+def _vectors_path(path: str) -> str:
+    return path + ".npy"
+
+def _read_vectors(path: str) -> np.ndarray:
+    """
+    Return the index's vectors as a read-only (n, dim) float32 array.
+    The `.npy` sidecar written by `save_index` is memory-mapped, so every
+    worker process searches the same page-cache copy. Indexes saved before
+    the sidecar existed are read from the FAISS file onto the heap instead.
+    """
+    vec_path = _vectors_path(path)
+    if os.path.exists(vec_path):
+        return np.load(vec_path, mmap_mode="r")
+    index = faiss.read_index(path)
+    return index.reconstruct_n(0, index.ntotal)
+
+def open_vectors_readonly(path: str):
+    """
+    Return `(vectors, contents)` for searching an existing index with
+    `search_vectors`. Results are cached per process (at most
+    `_READONLY_CACHE_MAX` indexes) and reloaded when the file changes on
+    disk; entries whose files have been deleted are dropped.
+    Unlike `load_index`, this does not touch the module-level `_CONTENTS`.
+    """
+    vec_path = _vectors_path(path)
+    mtime = os.path.getmtime(vec_path if os.path.exists(vec_path) else path)
+    with _READONLY_LOCK:
+        for stale in [p for p in _READONLY_CACHE if not os.path.exists(p)]:
+            del _READONLY_CACHE[stale]
+
+        cached = _READONLY_CACHE.get(path)
+        if cached and cached[0] == mtime:
+            _READONLY_CACHE.move_to_end(path)
+            return cached[1], cached[2]
+
+        vectors = _read_vectors(path)
+        meta_path = path + ".meta.json"
+        contents = []
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                contents = json.load(f)
+        _READONLY_CACHE[path] = (mtime, vectors, contents)
+        _READONLY_CACHE.move_to_end(path)
+        while len(_READONLY_CACHE) > _READONLY_CACHE_MAX:
+            _READONLY_CACHE.popitem(last=False)
+        return vectors, contents
+
+def remove_index(path: str):
+    """Delete an index file and its metadata/vector sidecars, if present."""
+    for p in (path, path + ".meta.json", _vectors_path(path)):
+        if os.path.exists(p):
+            os.remove(p)
+    with _READONLY_LOCK:
+        _READONLY_CACHE.pop(path, None)
+
+def save_index(index: faiss.IndexFlatIP, path: str, contents: list = None):
     """
     Persist both the FAISS index and the metadata list.
     Writes:
       - `path`             (the .faiss index file)
       - `path + ".meta.json"` (the JSON metadata)
+      - `path + ".npy"`    (the raw vectors, memory-mapped at search time)
+    Retrieval only reads the `.npy` copy; the `.faiss` file is kept so the
+    index still works with `load_index`/FAISS tooling and older readers.
+    `contents` defaults to the module-level `_CONTENTS`; pass a local list
+    when several requests may be building indexes concurrently.
     """
+    if contents is None:
+        contents = _CONTENTS
     faiss.write_index(index, path)
+    if index.ntotal:
+        vectors = index.reconstruct_n(0, index.ntotal)
+    else:
+        vectors = np.zeros((0, index.d), dtype=np.float32)
+    np.save(_vectors_path(path), np.ascontiguousarray(vectors, dtype=np.float32))
     meta_path = path + ".meta.json"
     with open(meta_path, "w", encoding="utf-8") as f:
-        json.dump(_CONTENTS, f, ensure_ascii=False, indent=2)
+        json.dump(contents, f, ensure_ascii=False, indent=2)
 
-def add_to_index(index: faiss.IndexFlatIP, embedding: np.ndarray, metadata: dict):
+def add_to_index(index: faiss.IndexFlatIP, embedding: np.ndarray, metadata: dict, contents: list = None):
     """
     Add a single embedding + its metadata to the index.
     `metadata` should include:
       - "text": the chunk’s text
       - "source": the source metadata
+    It is appended to `contents`, or to the module-level `_CONTENTS` if omitted.
     """
+    if contents is None:
+        contents = _CONTENTS
     index.add(embedding.reshape(1, -1))
-    _CONTENTS.append(metadata)
+    contents.append(metadata)
 
 def search_index(index: faiss.IndexFlatIP, query_emb: np.ndarray, top_k: int):
     """
@@ -72,3 +149,24 @@ def search_index(index: faiss.IndexFlatIP, query_emb: np.ndarray, top_k: int):
             "text":   entry.get("text", "")
         })
     return results
+
+def search_vectors(vectors: np.ndarray, query_emb: np.ndarray, top_k: int, contents: list):
+    """
+    Inner-product search over vectors from `open_vectors_readonly`, matching
+    what `IndexFlatIP.search` returns but without copying the vectors.
+    """
+    if len(vectors) == 0 or top_k <= 0:
+        return []
+    scores = vectors @ np.asarray(query_emb, dtype=np.float32).ravel()
+    k = min(top_k, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    results = []
+    for idx in top:
+        entry = contents[idx]
+        results.append({
+            "score": float(scores[idx]),
+            "source": entry.get("source", {}),
+            "text":   entry.get("text", "")
+        })
+    return results
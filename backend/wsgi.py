@@ -0,0 +1,25 @@
+# backend/wsgi.py
+#
+# Production entry point: `gunicorn backend.wsgi:app` (settings in gunicorn.conf.py).
+# With preload_app the module is imported once in the master, so the app code
+# (torch, faiss, ...) is shared copy-on-write. Models are loaded in each worker
+# after fork, except the LLM when PRELOAD_LLM is set.
+
+from backend.app import create_app
+from backend.utils.llm import get_llm
+
+app = create_app()
+
+if app.config["PRELOAD_LLM"]:
+    # Only safe without GPU offload: CUDA contexts do not survive fork()
+    if app.config["GPU_OFFLOAD"]:
+        raise RuntimeError(
+            "PRELOAD_LLM requires N_GPU_LAYERS=0: a GPU-offloaded model "
+            "cannot be loaded before Gunicorn forks its workers."
+        )
+    get_llm(
+        app.config["MODEL_PATH"],
+        n_ctx=app.config["N_CTX"],
+        n_gpu_layers=app.config["N_GPU_LAYERS"],
+        n_threads=app.config["N_THREADS"]
+    )
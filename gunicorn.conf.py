@@ -0,0 +1,22 @@
+# gunicorn.conf.py
+#
+# Multi-worker serving for the Flask API. Gunicorn picks this file up
+# automatically when started from the repo root:
+#
+#   gunicorn backend.wsgi:app
+
+from backend import config
+
+bind = config.BIND
+
+# Separate processes sidestep the GIL; threads keep I/O-bound requests moving.
+# Defaults to one worker per core, or a single worker when the LLM uses the GPU.
+workers = config.WEB_WORKERS
+threads = config.WEB_THREADS
+
+# Import the app code once in the master before forking workers; models
+# load lazily per worker so no CUDA context is created before fork()
+preload_app = True
+
+# LLM generation can take minutes on modest hardware
+timeout = config.WEB_TIMEOUT
@@ -1,5 +1,8 @@
 import streamlit as st
 import requests
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from requests.adapters import HTTPAdapter
+from requests_toolbelt.multipart.encoder import MultipartEncoder, MultipartEncoderMonitor
 from streamlit.runtime.secrets import StreamlitSecretNotFoundError
 
 try:
@@ -7,12 +10,131 @@ try:
 except (KeyError, StreamlitSecretNotFoundError):
     BACKEND_URL = "http://localhost:5000"
 
+# Concurrent uploads per browser session.
+# Safe now that /ingest/ keeps per-request state and locks the registry.
+UPLOAD_WORKERS = 4
+# Browser sessions the shared thread and HTTP pools are sized for; beyond
+# this, asks and uploads from different sessions queue behind each other
+MAX_SESSIONS = 8
+# How long the file list is cached between explicit invalidations
+FILES_TTL = 30
+
+@st.cache_resource
+def get_session():
+    # One keep-alive connection pool shared by every session, rerun and worker
+    # thread: room for each session's uploads, its ask and its script thread
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_SESSIONS * (UPLOAD_WORKERS + 2))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_resource
+def get_executor():
+    # Runs ask requests off the script thread so the UI stays responsive;
+    # shared by all sessions, each holding at most one live job
+    return ThreadPoolExecutor(max_workers=MAX_SESSIONS)
+
+@st.cache_resource
+def get_upload_pool():
+    # Outlives individual script runs, so a rerun does not wait on or lose uploads
+    return ThreadPoolExecutor(max_workers=MAX_SESSIONS * UPLOAD_WORKERS)
+
+@st.cache_data(ttl=FILES_TTL, show_spinner=False)
+def _fetch_files():
+    resp = get_session().get(f"{BACKEND_URL}/files/", timeout=10)
+    resp.raise_for_status()
+    return resp.json()
+
 def fetch_files():
+    # Errors are raised out of the cached function so they are never cached
     try:
-        return requests.get(f"{BACKEND_URL}/files/").json()
+        return _fetch_files()
     except requests.RequestException:
         return []
 
+def invalidate_files():
+    _fetch_files.clear()
+
+def upload_file(session, up, on_progress):
+    """
+    Stream `up` to /ingest/ as multipart, calling `on_progress(fraction)`
+    as bytes go out. Runs on the upload pool, so no `st.*` calls here.
+    """
+    up.seek(0)
+    encoder = MultipartEncoder(
+        fields={"file": (up.name, up, up.type or "application/octet-stream")}
+    )
+    monitor = MultipartEncoderMonitor(
+        encoder, lambda m: on_progress(m.bytes_read / max(m.len, 1))
+    )
+    resp = session.post(
+        f"{BACKEND_URL}/ingest/",
+        data=monitor,
+        headers={"Content-Type": monitor.content_type},
+        timeout=600
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+def run_query(session, query, top_k, file_ids):
+    """
+    Retrieve contexts and generate an answer.
+    Runs on the executor, without a ScriptRunContext, so it must not call
+    any `st.*` APIs (including cached functions like `get_session`).
+    Always returns a dict: the /respond/ payload, or {"error": message}.
+    """
+    try:
+        return _ask(session, query, top_k, file_ids)
+    except Exception as e:
+        return {"error": f"Unexpected error: {e}"}
+
+def _ask(session, query, top_k, file_ids):
+    payload = {"query": query, "top_k": top_k, "file_ids": file_ids}
+    try:
+        ret = session.post(f"{BACKEND_URL}/ask/", json=payload, timeout=60)
+    except requests.RequestException as e:
+        return {"error": f"Retrieval error: {e}"}
+    if not ret.ok:
+        return {"error": f"Retrieval error: {ret.status_code} {ret.text}"}
+
+    data = ret.json()
+    try:
+        gen = session.post(
+            f"{BACKEND_URL}/respond/",
+            json={
+                "trace_id": data.get("trace_id"),
+                "query":    query,
+                "results":  data.get("results", [])
+            },
+            timeout=300
+        )
+        gen.raise_for_status()
+        return gen.json()
+    except requests.ReadTimeout:
+        return {"error": (
+            "Generation is taking too long—"
+            "try reducing ‘Number of contexts’ or raising the timeout."
+        )}
+    except requests.RequestException as e:
+        return {"error": f"Generation error: {e}"}
+
+def _upload_key(up):
+    return getattr(up, "file_id", None) or (up.name, up.size)
+
+def _progress_setter(progress):
+    # Called from the upload thread; only writes a plain dict
+    def on_progress(fraction):
+        progress["sent"] = fraction
+    return on_progress
+
+st.session_state.setdefault("uploaded", set())
+# Failed uploads, key -> (name, error); only re-sent when the user retries
+st.session_state.setdefault("failed", {})
+# Uploads submitted but not yet collected, key -> {"name", "progress", "future"}
+st.session_state.setdefault("in_flight", {})
+st.session_state.setdefault("job", None)
+
 st.title("📚 RAG Chatbot")
 
 # Sidebar: file list, delete, upload
@@ -26,9 +148,10 @@ file_id = file_map.get(selected_name)
 
 if st.sidebar.button("🗑️ Delete selected file"):
     if file_id:
-        resp = requests.delete(f"{BACKEND_URL}/files/", json={"files": [selected_name]})
+        resp = get_session().delete(f"{BACKEND_URL}/files/", json={"files": [selected_name]})
         if resp.ok:
             st.sidebar.success(f"Deleted {selected_name}")
+            invalidate_files()
             files = fetch_files()
             file_map = {f["name"]: f["id"] for f in files}
             file_names = list(file_map.keys())
@@ -38,9 +161,10 @@ if st.sidebar.button("🗑️ Delete selected file"):
         st.sidebar.warning("No file selected to delete")
 
 if st.sidebar.button("🗑️ Delete all files"):
-    resp = requests.delete(f"{BACKEND_URL}/files/", json={"files": "all"})
+    resp = get_session().delete(f"{BACKEND_URL}/files/", json={"files": "all"})
     if resp.ok:
         st.sidebar.success("Deleted all files")
+        invalidate_files()
         files = fetch_files()
         file_map = {f["name"]: f["id"] for f in files}
         file_names = list(file_map.keys())
@@ -54,14 +178,91 @@ uploads = st.sidebar.file_uploader(
     accept_multiple_files=True
 )
 
-if uploads:
-    for up in uploads:
-        requests.post(f"{BACKEND_URL}/ingest/", files={"file": (up.name, up.getvalue())})
-    st.sidebar.success("Uploads complete")
+# Forget failures for files that were removed from the uploader
+upload_keys = {_upload_key(up) for up in uploads or []}
+st.session_state.failed = {
+    key: err for key, err in st.session_state.failed.items() if key in upload_keys
+}
+
+# The uploader keeps its files across reruns, so only send new ones
+in_flight = st.session_state.in_flight
+pending = [
+    up for up in uploads or []
+    if _upload_key(up) not in st.session_state.uploaded
+    and _upload_key(up) not in st.session_state.failed
+    and _upload_key(up) not in in_flight
+]
+if pending:
+    # Resolve cached resources here: worker threads have no ScriptRunContext
+    session = get_session()
+    pool = get_upload_pool()
+    # Record every key as in flight before any st.* call, so a rerun raised
+    # mid-upload (any widget click) cannot send the same file again
+    for up in pending:
+        progress = {"sent": 0.0}
+        in_flight[_upload_key(up)] = {
+            "name":     up.name,
+            "progress": progress,
+            "future":   pool.submit(upload_file, session, up, _progress_setter(progress))
+        }
+
+if in_flight:
+    bars = {key: st.sidebar.progress(0.0, text=f"⏳ {job['name']}") for key, job in in_flight.items()}
+    finished_count = 0
+    batch_failed = 0
+    # Streamlit elements are only touched here, on the script thread. If a
+    # rerun interrupts this loop, the next run picks up the same futures.
+    while in_flight:
+        for key, job in list(in_flight.items()):
+            fut = job["future"]
+            if not fut.done():
+                frac = job["progress"]["sent"]
+                if not fut.running():
+                    label = "Queued"
+                elif frac >= 1.0:
+                    label = "Indexing"
+                else:
+                    label = f"Uploading {frac:.0%}"
+                bars[key].progress(frac, text=f"⏳ {job['name']} — {label}")
+                continue
+
+            try:
+                result = fut.result()
+                st.session_state.uploaded.add(key)
+                error = None
+            except Exception as e:
+                st.session_state.failed[key] = (job["name"], str(e))
+                error = e
+            del in_flight[key]
+            finished_count += 1
+
+            if error is None:
+                bars[key].progress(1.0, text=f"✅ {job['name']} ({result.get('chunks', 0)} chunks)")
+            else:
+                batch_failed += 1
+                bars[key].progress(job["progress"]["sent"], text=f"❌ {job['name']}: {error}")
+
+        if in_flight:
+            wait([job["future"] for job in in_flight.values()], timeout=0.2, return_when=FIRST_COMPLETED)
+
+    if batch_failed:
+        st.sidebar.warning(f"{batch_failed} of {finished_count} uploads failed")
+    else:
+        st.sidebar.success("Uploads complete")
+    invalidate_files()
     files = fetch_files()
     file_map = {f["name"]: f["id"] for f in files}
     file_names = list(file_map.keys())
 
+if st.session_state.failed:
+    st.sidebar.error(
+        "Failed uploads:\n"
+        + "\n".join(f"- {name}: {err}" for name, err in st.session_state.failed.values())
+    )
+    if st.sidebar.button("🔁 Retry failed uploads"):
+        st.session_state.failed = {}
+        st.rerun()
+
 # Main: select files for querying
 st.header("💬 Ask a Question")
 selected_files = st.multiselect(
@@ -80,47 +281,54 @@ if st.button("Ask"):
         st.warning("Please select at least one file.")
     else:
         file_ids = [file_map[name] for name in selected_files]
-        payload = {"query": query, "top_k": top_k, "file_ids": file_ids}
-        ret = requests.post(f"{BACKEND_URL}/ask/", json=payload, timeout=60)
+        # Drop a superseded ask: cancel it if still queued. A running one
+        # cannot be interrupted, but its result is no longer shown.
+        prev = st.session_state.job
+        if prev is not None and not prev.done():
+            prev.cancel()
+        st.session_state.job = get_executor().submit(
+            run_query, get_session(), query, top_k, file_ids
+        )
 
-        if not ret.ok:
-            st.error(f"Retrieval error: {ret.status_code} {ret.text}")
+def show_answer():
+    job = st.session_state.job
+    if job is None:
+        return
+    if not job.done():
+        if job.running():
+            st.info("⏳ Generating answer, please be patient…")
         else:
-            data = ret.json()
-            trace = data.get("trace_id")
-            contexts = data.get("results", [])
-            with st.spinner("Generating answer, please be patient…"):
-                try:
-                    gen = requests.post(
-                        f"{BACKEND_URL}/respond/",
-                        json={
-                            "trace_id": trace,
-                            "query":    query,
-                            "results":  contexts
-                        },
-                        timeout=300
-                    )
-                    gen.raise_for_status()
-                    out = gen.json()
-                except requests.ReadTimeout:
-                    st.error(
-                        "Generation is taking too long—"
-                        "try reducing ‘Number of contexts’ or raising the timeout."
-                    )
-                    st.stop()
-                except requests.RequestException as e:
-                    st.error(f"Generation error: {e}")
-                    st.stop()
-
-            # display the answer & sources as before
-            st.markdown("### 🤖 Answer")
-            st.write(out.get("answer", "No answer returned."))
-
-            st.markdown("### 📑 Sources")
-            for src in out.get("sources", []):
-                name   = src.get("filename", "unknown")
-                meta   = src.get("source", {})
-                # try page, then slide
-                loc    = meta.get("page") or meta.get("slide") or "?"
-                score  = src.get("score", 0.0)
-                st.write(f"- **{name}**, page/slide {loc} (score: {score:.3f})")
\ No newline at end of file
+            st.info("⏳ Waiting for a free worker…")
+        return
+
+    try:
+        out = job.result()
+    except Exception as e:
+        # Keep the {"error": ...} shape so a stale job cannot re-raise on every rerun
+        out = {"error": f"Unexpected error: {e}"}
+    if st.session_state.get("_polling"):
+        # Rerun once without polling now that the answer is in
+        st.session_state._polling = False
+        st.rerun()
+
+    if "error" in out:
+        st.error(out["error"])
+        return
+
+    # display the answer & sources as before
+    st.markdown("### 🤖 Answer")
+    st.write(out.get("answer", "No answer returned."))
+
+    st.markdown("### 📑 Sources")
+    for src in out.get("sources", []):
+        name   = src.get("filename", "unknown")
+        meta   = src.get("source", {})
+        # try page, then slide
+        loc    = meta.get("page") or meta.get("slide") or "?"
+        score  = src.get("score", 0.0)
+        st.write(f"- **{name}**, page/slide {loc} (score: {score:.3f})")
+
+# Poll only while a request is in flight; the rest of the page stays interactive
+job = st.session_state.job
+st.session_state._polling = job is not None and not job.done()
+st.fragment(show_answer, run_every=1 if st.session_state._polling else None)()